@@ -1,11 +1,18 @@
 import streamlit as st
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import pandas as pd
-import yfinance as yf
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import yfinance
+import yfinance_cache as yf
 from datetime import datetime, timedelta
-import ta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from tsdownsample import MinMaxLTTBDownsampler
 from curl_cffi import requests
-from styles import COLORS
+from styles import COLORS, CHART_LAYOUT, CHART_AXIS, INDICATOR_COLORS
+from indicators_nb import compute_all, NUMBA_AVAILABLE
 
 # Currency mapping and symbols
 CURRENCY_MAP = {
@@ -23,25 +30,74 @@ CURRENCY_SYMBOLS = {
     'BRL': 'R$', 'MXN': 'MX$'
 }
 
+# Quick watchlist shown in the sidebar, plus its flattened symbol key for fetch_many
+WATCHLIST = {
+    'US Tech': ['AAPL', 'GOOGL', 'MSFT'],
+    'European': ['SAP.DE', 'ASML.AS'],
+    'Asian': ['TSM', '7203.T'],
+    'Indonesian': ['GOTO.JK', 'BBCA.JK', 'TLKM.JK']
+}
+WATCHLIST_SYMBOLS = tuple(sorted({s for symbols in WATCHLIST.values() for s in symbols}))
+
+# Timezone names that already match the US/Eastern display time
+EASTERN_TIMEZONES = {'US/Eastern', 'America/New_York'}
+
+# Columns kept from Yahoo history frames
+PRICE_COLUMNS = ['Datetime', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+# Columns produced by compute_all, in output order
+INDICATOR_COLUMNS = ['SMA_20', 'SMA_50', 'EMA_20', 'RSI', 'MACD', 'MACD_Signal',
+                     'MACD_Hist', 'BB_Upper', 'BB_Lower']
+
+# Indicators computed only when selected: sidebar label -> its columns,
+# in compute_all's flag order
+OPTIONAL_INDICATORS = {
+    'EMA 20': ['EMA_20'],
+    'MACD': ['MACD', 'MACD_Signal', 'MACD_Hist'],
+    'Bollinger Bands': ['BB_Upper', 'BB_Lower', 'BB_Middle']
+}
+
+# Overlay line indicators: sidebar label -> indicator column
+_LINE_INDICATORS = {'SMA 20': 'SMA_20', 'SMA 50': 'SMA_50', 'EMA 20': 'EMA_20'}
+
+# Maximum number of points sent to Plotly per trace
+MAX_CHART_POINTS = 2000
+
+# Oldest bars yfinance-cache may serve from disk, matching the 30 s fetch TTLs;
+# its per-interval defaults (4 h for daily bars, 60 h for weekly) would freeze
+# the live views
+LIVE_MAX_AGE = timedelta(seconds=30)
+
 @st.cache_resource
 def get_session():
     """Get curl_cffi session for yfinance"""
-    return requests.Session(impersonate="chrome")
+    return requests.Session(impersonate="chrome", default_headers=True)
 
-def get_currency(ticker):
-    """Get currency for ticker"""
-    try:
-        session = get_session()
-        info = yf.Ticker(ticker, session=session).info
-        if 'currency' in info:
-            return info['currency']
-    except:
-        pass
-    
-    # Fallback to suffix mapping
-    for suffix, currency in CURRENCY_MAP.items():
-        if ticker.upper().endswith(suffix):
-            return currency
+@lru_cache(maxsize=512)
+def _ticker(symbol):
+    """Get a reusable yfinance Ticker bound to the shared session"""
+    return yf.Ticker(symbol, session=get_session())
+
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def get_quote_currency(ticker):
+    """Get the currency Yahoo quotes ticker in, cached for an hour per ticker"""
+    # Plain yfinance resolves FastInfo fields lazily; yfinance-cache's fast_info
+    # fetches every field up front and fails on the first missing one
+    return yfinance.Ticker(ticker, session=get_session()).fast_info['currency']
+
+def get_currency(ticker, use_info=False):
+    """Get currency for ticker from its exchange suffix, optionally asking Yahoo otherwise"""
+    if '.' in ticker:
+        suffix = '.' + ticker.rpartition('.')[2].upper()
+        if suffix in CURRENCY_MAP:
+            return CURRENCY_MAP[suffix]
+    
+    # Tickers without a known suffix are US listings unless Yahoo says otherwise
+    if use_info:
+        try:
+            return get_quote_currency(ticker)
+        except:
+            pass
     return 'USD'
 
 def format_price(price, currency):
@@ -55,62 +111,148 @@ def format_price(price, currency):
 def fetch_data(ticker, period, interval):
     """Fetch stock data with caching"""
     try:
-        session = get_session()
-        yf_ticker = yf.Ticker(ticker, session=session)
+        yf_ticker = _ticker(ticker)
         
         if period == '1wk':
             end_date = datetime.now()
             start_date = end_date - timedelta(days=7)
-            data = yf_ticker.history(start=start_date, end=end_date, interval=interval)
+            data = yf_ticker.history(start=start_date, end=end_date, interval=interval, max_age=LIVE_MAX_AGE)
         else:
-            data = yf_ticker.history(period=period, interval=interval)
+            data = yf_ticker.history(period=period, interval=interval, max_age=LIVE_MAX_AGE)
         
         if data.empty:
             return pd.DataFrame()
         
-        # Process timezone
-        if data.index.tzinfo is None:
-            data.index = data.index.tz_localize('UTC')
-        data.index = data.index.tz_convert('US/Eastern')
-        data.reset_index(inplace=True)
-        data.rename(columns={'Date': 'Datetime'}, inplace=True)
-        
-        return data
+        return _prepare_history(data)
     except Exception as e:
         st.error(f"Error fetching {ticker}: {str(e)}")
         return pd.DataFrame()
 
-def add_indicators(data):
-    """Add technical indicators"""
-    if data.empty or len(data) < 20:
-        return data
+@st.cache_resource
+def get_executor():
+    """Get shared thread pool for concurrent Yahoo requests"""
+    return ThreadPoolExecutor(max_workers=16)
+
+@st.cache_data(ttl=30)
+def fetch_many(tickers, period, interval):
+    """Fetch several tickers concurrently, keyed by symbol"""
+    tickers = [t.upper() for t in tickers]
+    # Resolve Ticker objects up front so worker threads never touch Streamlit
+    yf_tickers = [_ticker(t) for t in tickers]
+    
+    def fetch_one(yf_ticker):
+        try:
+            data = yf_ticker.history(period=period, interval=interval, max_age=LIVE_MAX_AGE)
+        except Exception:
+            return pd.DataFrame()
+        return _prepare_history(data) if not data.empty else pd.DataFrame()
     
-    # Moving averages
-    data['SMA_20'] = ta.trend.sma_indicator(data['Close'], window=20)
-    data['SMA_50'] = ta.trend.sma_indicator(data['Close'], window=50)
-    data['EMA_20'] = ta.trend.ema_indicator(data['Close'], window=20)
+    return dict(zip(tickers, get_executor().map(fetch_one, yf_tickers)))
+
+def _prepare_history(data):
+    """Convert a history frame to US/Eastern with a Datetime column and plotted columns only"""
+    # Process timezone; US listings usually arrive in Eastern time already
+    tz = data.index.tz
+    if tz is None:
+        data.index = data.index.tz_localize('UTC')
+    if str(tz) not in EASTERN_TIMEZONES:
+        data.index = data.index.tz_convert('US/Eastern')
+    data.insert(0, 'Datetime', data.index)
+    data.reset_index(drop=True, inplace=True)
     
-    # RSI
-    data['RSI'] = ta.momentum.rsi(data['Close'], window=14)
+    # Dividends/Stock Splits are never plotted, and prices only need single
+    # precision; halves memory and chart payload
+    return data[PRICE_COLUMNS].astype({col: np.float32 for col in ['Open', 'High', 'Low', 'Close']})
+
+def _seeded_ewm(values, alpha, start, window):
+    """Recursive EMA from bar start onward, seeded with the mean of the window ending there"""
+    out = np.full(len(values), np.nan)
+    if start >= len(values):
+        return out
+    tail = values[start:].copy()
+    tail[0] = values[start - window + 1:start + 1].mean()
+    out[start:] = pd.Series(tail).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+def _windows(values, window):
+    """Strided (n - window + 1, window) view of every full window, or an empty one if too short"""
+    if len(values) < window:
+        return np.empty((0, window))
+    return sliding_window_view(values, window)
+
+def _pad_window(values, window_stat, window):
+    """Align a per-window statistic with the bars, NaN before the first full window"""
+    out = np.full(len(values), np.nan)
+    out[window - 1:] = window_stat
+    return out
+
+def compute_all_vectorized(close, with_ema=True, with_macd=True, with_bb=True):
+    """Compute the indicators with pandas/NumPy, matching compute_all"""
+    n = len(close)
+    
+    # SMA 20 / Bollinger Bands share one set of 20-bar windows
+    windows_20 = _windows(close, 20)
+    sma_20 = _pad_window(close, windows_20.mean(axis=1), 20)
+    std_20 = _pad_window(close, windows_20.std(axis=1), 20) if with_bb else np.full(n, np.nan)
+    sma_50 = _pad_window(close, _windows(close, 50).mean(axis=1), 50)
+    
+    # EMAs seeded with the SMA of their first window, as in TA-Lib; a start
+    # past the last bar skips that EMA
+    ema_20 = _seeded_ewm(close, 2 / 21, 19 if with_ema else n, 20)
+    ema_12 = _seeded_ewm(close, 2 / 13, 25 if with_macd else n, 12)
+    ema_26 = _seeded_ewm(close, 2 / 27, 25 if with_macd else n, 26)
+    
+    # MACD (12, 26, 9); the signal starts on bar 33
+    macd = ema_12 - ema_26
+    macd_signal = _seeded_ewm(macd, 2 / 10, 33 if with_macd else n, 9)
+    macd[:33] = np.nan
+    macd_hist = macd - macd_signal
+    
+    # RSI (Wilder, 14)
+    change = np.diff(close, prepend=np.nan)
+    gain = np.clip(change, 0, None)
+    loss = np.clip(-change, 0, None)
+    avg_gain = _seeded_ewm(gain, 1 / 14, 14, 14)
+    avg_loss = _seeded_ewm(loss, 1 / 14, 14, 14)
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(total != 0, 100 * avg_gain / total, 0.0)
+    rsi[np.isnan(total)] = np.nan
+    
+    return (sma_20, sma_50, ema_20, rsi, macd, macd_signal, macd_hist,
+            sma_20 + 2 * std_20, sma_20 - 2 * std_20)
+
+def add_indicators(data, wanted=None):
+    """Add technical indicators"""
+    # wanted limits OPTIONAL_INDICATORS to the selected sidebar labels; SMA 20/50
+    # and RSI always feed the analysis summary
+    if len(data) < 20:
+        return data
     
-    # MACD
-    macd = ta.trend.MACD(data['Close'])
-    data['MACD'] = macd.macd()
-    data['MACD_Signal'] = macd.macd_signal()
-    data['MACD_Hist'] = macd.macd_diff()
+    flags = tuple(wanted is None or label in wanted for label in OPTIONAL_INDICATORS)
+    compute = compute_all if NUMBA_AVAILABLE else compute_all_vectorized
+    values = compute(data['Close'].to_numpy(dtype=np.float64), *flags)
+    columns = {name: column.astype(np.float32) for name, column in zip(INDICATOR_COLUMNS, values)}
+    columns['BB_Middle'] = columns['SMA_20']
     
-    # Bollinger Bands
-    bb = ta.volatility.BollingerBands(data['Close'])
-    data['BB_Upper'] = bb.bollinger_hband()
-    data['BB_Lower'] = bb.bollinger_lband()
-    data['BB_Middle'] = bb.bollinger_mavg()
+    # Leave skipped indicators out entirely rather than as NaN columns
+    for label, selected in zip(OPTIONAL_INDICATORS, flags):
+        if not selected:
+            for name in OPTIONAL_INDICATORS[label]:
+                del columns[name]
     
-    return data
+    # Assign every column at once to avoid fragmenting the frame
+    return data.assign(**columns)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_data_with_indicators(ticker, period, interval, wanted=None):
+    """Fetch stock data with indicators, cached on the request parameters and indicator set"""
+    return add_indicators(fetch_data(ticker, period, interval), wanted)
 
 def calculate_metrics(data):
     """Calculate basic metrics"""
     if data.empty:
-        return None, None, None, None, None, None
+        return None, None, None, None, None, None, False
     
     last_close = data['Close'].iloc[-1]
     first_close = data['Close'].iloc[0]
@@ -119,278 +261,238 @@ def calculate_metrics(data):
     high = data['High'].max()
     low = data['Low'].min()
     volume = data['Volume'].sum()
+    # Reused by the page to decide whether to draw the volume pane
+    has_volume = bool(data['Volume'].notna().any())
     
-    return last_close, change, pct_change, high, low, volume
+    return last_close, change, pct_change, high, low, volume, has_volume
+
+def _downsample_line(data, n_out=MAX_CHART_POINTS):
+    """Select rows to plot with MinMaxLTTB when the series is too long"""
+    n = len(data)
+    if n <= n_out:
+        return np.arange(n), data
+    
+    idx = MinMaxLTTBDownsampler().downsample(data['Close'].to_numpy(dtype=np.float64), n_out=n_out)
+    idx = idx.astype(np.int64)
+    return idx, data.iloc[idx]
+
+def _downsample_ohlc(data, n_out=MAX_CHART_POINTS):
+    """Aggregate bars into at most n_out buckets (first open, max high, min low, last close, summed volume)"""
+    n = len(data)
+    if n <= n_out:
+        return np.arange(n), data
+    
+    starts = np.linspace(0, n, n_out, endpoint=False).astype(np.int64)
+    ends = np.append(starts[1:], n) - 1
+    sampled = data.iloc[starts].copy()
+    sampled['High'] = np.maximum.reduceat(data['High'].to_numpy(), starts)
+    sampled['Low'] = np.minimum.reduceat(data['Low'].to_numpy(), starts)
+    sampled['Close'] = data['Close'].to_numpy()[ends]
+    sampled['Volume'] = np.add.reduceat(data['Volume'].to_numpy(), starts)
+    return starts, sampled
 
-def create_price_chart(data, ticker, currency, chart_type, indicators):
-    """Create main price chart without gaps"""
-    fig = go.Figure()
+def _df_fingerprint(df):
+    """Cheap cache key for a price frame: its shape, columns, time span, closes and volumes"""
+    if df.empty:
+        return (0, tuple(df.columns))
+    return (df.shape, tuple(df.columns), df['Datetime'].iloc[0].value, df['Datetime'].iloc[-1].value,
+            hash(df['Close'].to_numpy().tobytes()), hash(df['Volume'].to_numpy().tobytes()))
+
+@st.cache_resource(max_entries=32, hash_funcs={pd.DataFrame: _df_fingerprint})
+def create_dashboard_figure(data, ticker, currency, chart_type, indicators, show_volume):
+    """Create main price chart without gaps, with an optional volume pane sharing its x-axis"""
+    # Filter data to remove non-trading periods (any non-positive OHLCV value)
+    mask = (data[['Volume', 'High', 'Low', 'Close', 'Open']].to_numpy() > 0).all(axis=1)
     
-    # Filter data to remove non-trading periods
-    filtered_data = data[
-        (data['Volume'] > 0) & 
-        (data['High'] > 0) & 
-        (data['Low'] > 0) &
-        (data['Close'] > 0) &
-        (data['Open'] > 0)
-    ].copy()
+    # Everything downstream is positional, so the kept rows need no index reset
+    # (and no copy at all when every row passes)
+    filtered_data = data.iloc[mask] if mask.any() and not mask.all() else data
     
-    if filtered_data.empty:
-        filtered_data = data.copy()
+    # Downsample long series; x positions stay in the full-series index space
+    if chart_type == 'Candlestick':
+        x_positions, plot_data = _downsample_ohlc(filtered_data)
+        volume_x, volume_data = x_positions, plot_data
+    else:
+        x_positions, plot_data = _downsample_line(filtered_data)
+        # Volume is summed over uniform buckets; LTTB's uneven gaps would scale
+        # it with the price shape
+        volume_x, volume_data = _downsample_ohlc(filtered_data) if show_volume else (x_positions, plot_data)
+    
+    # Hover timestamps are formatted once and shared by every trace
+    hover_time = plot_data['Datetime'].dt.strftime('%Y-%m-%d %H:%M').to_numpy()
+    volume_hover_time = (hover_time if volume_data is plot_data
+                         else volume_data['Datetime'].dt.strftime('%Y-%m-%d %H:%M').to_numpy())
+    
+    rows = 2 if show_volume else 1
+    fig = make_subplots(rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.02,
+                        row_heights=[0.75, 0.25][:rows])
+    add_price_traces(fig, plot_data, x_positions, hover_time, ticker, chart_type, indicators, row=1)
+    if show_volume:
+        add_volume_traces(fig, volume_data, volume_x, volume_hover_time, row=2)
+        fig.update_yaxes(title_text="Volume", row=2, col=1)
+        # A candlestick range slider would sit between the two panes
+        fig.update_xaxes(rangeslider_visible=False, row=1, col=1)
     
-    # Reset index for continuous x-axis
-    filtered_data.reset_index(drop=True, inplace=True)
-    x_positions = list(range(len(filtered_data)))
+    # Create custom tick labels
+    tick_format = '%m/%d %H:%M' if len(filtered_data) <= 50 else '%m/%d/%y'
+    tickvals, ticktext = make_time_ticks(filtered_data['Datetime'], fmt=tick_format)
+    
+    fig.update_xaxes(
+        tickmode='array',
+        tickvals=tickvals,
+        ticktext=ticktext,
+        **CHART_AXIS
+    )
+    fig.update_xaxes(title_text="Time", row=rows, col=1)
+    fig.update_yaxes(**CHART_AXIS)
+    fig.update_yaxes(title_text=f"Price ({currency})", row=1, col=1)
+    fig.update_layout(
+        title=f"{ticker} - {currency}",
+        height=800 if show_volume else 600,
+        hovermode='x unified',
+        **CHART_LAYOUT
+    )
     
+    return fig
+
+def add_price_traces(fig, data, x_positions, hover_time, ticker, chart_type, indicators, row=1, col=1):
+    """Add price and overlay indicator traces, with hover_time as the hover timestamps"""
     if chart_type == 'Candlestick':
         fig.add_trace(go.Candlestick(
             x=x_positions,
-            open=filtered_data['Open'], 
-            high=filtered_data['High'],
-            low=filtered_data['Low'], 
-            close=filtered_data['Close'],
+            open=data['Open'].to_numpy(), 
+            high=data['High'].to_numpy(),
+            low=data['Low'].to_numpy(), 
+            close=data['Close'].to_numpy(),
             name=ticker,
+            customdata=hover_time,
+            hovertemplate='Time: %{customdata}<br>Open: %{open:.2f}<br>High: %{high:.2f}'
+                          '<br>Low: %{low:.2f}<br>Close: %{close:.2f}',
             increasing_line_color=COLORS['success'],
             decreasing_line_color=COLORS['danger']
-        ))
+        ), row=row, col=col)
     else:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=x_positions, 
-            y=filtered_data['Close'],
+            y=data['Close'].to_numpy(),
             mode='lines', 
             name=f'{ticker} Close',
+            customdata=hover_time,
+            hovertemplate='Time: %{customdata}<br>Close: %{y:.2f}',
             line=dict(width=2, color=COLORS['primary'])
-        ))
+        ), row=row, col=col)
     
     # Add indicators
-    colors = [COLORS['secondary'], COLORS['warning'], COLORS['info'], COLORS['primary'], COLORS['danger']]
     color_idx = 0
     
     for indicator in indicators:
-        if indicator == 'SMA 20' and 'SMA_20' in filtered_data.columns:
-            fig.add_trace(go.Scatter(
-                x=x_positions, y=filtered_data['SMA_20'],
-                name='SMA 20', line=dict(color=colors[color_idx % len(colors)], width=1.5)
-            ))
-            color_idx += 1
-            
-        elif indicator == 'SMA 50' and 'SMA_50' in filtered_data.columns:
-            fig.add_trace(go.Scatter(
-                x=x_positions, y=filtered_data['SMA_50'],
-                name='SMA 50', line=dict(color=colors[color_idx % len(colors)], width=1.5)
-            ))
+        column = _LINE_INDICATORS.get(indicator)
+        if column is not None and column in data.columns:
+            fig.add_trace(go.Scattergl(
+                x=x_positions, y=data[column].to_numpy(),
+                name=indicator, line=dict(color=INDICATOR_COLORS[color_idx % len(INDICATOR_COLORS)], width=1.5)
+            ), row=row, col=col)
             color_idx += 1
             
-        elif indicator == 'EMA 20' and 'EMA_20' in filtered_data.columns:
-            fig.add_trace(go.Scatter(
-                x=x_positions, y=filtered_data['EMA_20'],
-                name='EMA 20', line=dict(color=colors[color_idx % len(colors)], width=1.5)
-            ))
-            color_idx += 1
-            
-        elif indicator == 'Bollinger Bands' and 'BB_Upper' in filtered_data.columns:
-            fig.add_trace(go.Scatter(
-                x=x_positions, y=filtered_data['BB_Upper'],
+        elif indicator == 'Bollinger Bands' and 'BB_Upper' in data.columns:
+            fig.add_trace(go.Scattergl(
+                x=x_positions, y=data['BB_Upper'].to_numpy(),
                 name='BB Upper', line=dict(color=COLORS['text_muted'], width=1),
                 opacity=0.5
-            ))
-            fig.add_trace(go.Scatter(
-                x=x_positions, y=filtered_data['BB_Lower'],
+            ), row=row, col=col)
+            fig.add_trace(go.Scattergl(
+                x=x_positions, y=data['BB_Lower'].to_numpy(),
                 name='BB Lower', line=dict(color=COLORS['text_muted'], width=1),
                 fill='tonexty', fillcolor='rgba(128, 128, 128, 0.1)',
                 opacity=0.5
-            ))
-            fig.add_trace(go.Scatter(
-                x=x_positions, y=filtered_data['BB_Middle'],
+            ), row=row, col=col)
+            fig.add_trace(go.Scattergl(
+                x=x_positions, y=data['BB_Middle'].to_numpy(),
                 name='BB Middle', line=dict(color=COLORS['text_muted'], width=1.5, dash='dash')
-            ))
-    
-    # Create custom tick labels
-    n_ticks = min(10, len(filtered_data))
-    tick_interval = max(1, len(filtered_data) // n_ticks)
-    tickvals = list(range(0, len(filtered_data), tick_interval))
-    ticktext = []
-    
-    for i in tickvals:
-        if i < len(filtered_data):
-            dt = filtered_data['Datetime'].iloc[i]
-            if len(filtered_data) <= 50:
-                ticktext.append(dt.strftime('%m/%d %H:%M'))
-            else:
-                ticktext.append(dt.strftime('%m/%d/%y'))
-    
-    fig.update_layout(
-        title=f"{ticker} - {currency}",
-        xaxis_title="Time", 
-        yaxis_title=f"Price ({currency})",
-        height=600,
-        hovermode='x unified',
-        xaxis=dict(
-            tickmode='array',
-            tickvals=tickvals,
-            ticktext=ticktext,
-            showgrid=True,
-            gridcolor=COLORS['border']
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor=COLORS['border']
-        ),
-        paper_bgcolor=COLORS['bg_primary'],
-        plot_bgcolor=COLORS['bg_secondary'],
-        font=dict(color=COLORS['text_primary'])
-    )
-    
-    return fig
+            ), row=row, col=col)
 
-def create_volume_chart(data):
-    """Create volume chart"""
-    data_copy = data.copy()
-    data_copy['x_index'] = range(len(data_copy))
-    
-    vol_colors = [COLORS['success'] if c >= o else COLORS['danger']
-                    for c, o in zip(data_copy['Close'], data_copy['Open'])]
-    
-    fig = go.Figure(data=go.Bar(
-        x=data_copy['x_index'], 
-        y=data_copy['Volume'],
+def add_volume_traces(fig, data, x_positions, hover_time, row=1, col=1):
+    """Add volume bars colored by candle direction"""
+    vol_colors = np.where(data['Close'].to_numpy() >= data['Open'].to_numpy(),
+                          COLORS['success'], COLORS['danger'])
+    
+    fig.add_trace(go.Bar(
+        x=x_positions, 
+        y=data['Volume'].to_numpy(),
+        name='Volume',
+        customdata=hover_time,
+        hovertemplate='Time: %{customdata}<br>Volume: %{y:,}',
         marker_color=vol_colors, 
-        opacity=0.7
-    ))
-    
-    # Configure x-axis
-    n_points = len(data_copy)
-    step = max(1, n_points // 10)
-    tick_indices = list(range(0, n_points, step))
-    
-    tick_values = [data_copy.iloc[i]['x_index'] for i in tick_indices]
-    tick_texts = [data_copy.iloc[i]['Datetime'].strftime('%m/%d') for i in tick_indices]
+        opacity=0.7,
+        showlegend=False
+    ), row=row, col=col)
+
+def make_time_ticks(dt_series, n=10, fmt='%m/%d'):
+    """Pick up to n evenly spaced tick positions and their labels in the given format"""
+    idx = np.linspace(0, len(dt_series) - 1, min(n, len(dt_series)), dtype=int)
+    # Index the backing DatetimeArray directly; no intermediate Series or .dt accessor
+    return idx.tolist(), dt_series.array[idx].strftime(fmt).tolist()
+
+@st.cache_resource(max_entries=32, hash_funcs={pd.DataFrame: _df_fingerprint})
+def create_technical_figure(data, indicators, tickvals, ticktext):
+    """Create RSI and MACD panels side by side in one figure"""
+    panels = [name for name in ['RSI', 'MACD'] if name in indicators and name in data.columns]
+    if not panels:
+        return None
+    
+    titles = {'RSI': "RSI (14)", 'MACD': "MACD"}
+    fig = make_subplots(rows=1, cols=len(panels), subplot_titles=[titles[name] for name in panels])
+    x_positions = np.arange(len(data))
+    hover_time = data['Datetime'].dt.strftime('%m/%d %H:%M').to_numpy()
+    for col, name in enumerate(panels, start=1):
+        if name == 'RSI':
+            add_rsi_traces(fig, data, x_positions, hover_time, row=1, col=col)
+        else:
+            add_macd_traces(fig, data, x_positions, hover_time, row=1, col=col)
     
-    fig.update_layout(
-        title="Trading Volume",
-        height=200,
-        showlegend=False,
-        xaxis=dict(
-            tickmode='array',
-            tickvals=tick_values,
-            ticktext=tick_texts,
-            showgrid=True,
-            gridcolor=COLORS['border']
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor=COLORS['border']
-        ),
-        paper_bgcolor=COLORS['bg_primary'],
-        plot_bgcolor=COLORS['bg_secondary'],
-        font=dict(color=COLORS['text_primary'])
+    fig.update_xaxes(
+        tickmode='array',
+        tickvals=tickvals,
+        ticktext=ticktext,
+        **CHART_AXIS
     )
+    fig.update_yaxes(**CHART_AXIS)
+    fig.update_layout(height=250, **CHART_LAYOUT)
     
     return fig
 
-def create_rsi_chart(data):
-    """Create RSI chart"""
-    data_copy = data.copy()
-    data_copy['x_index'] = range(len(data_copy))
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=data_copy['x_index'], y=data_copy['RSI'],
+def add_rsi_traces(fig, data, x_positions, hover_time, row=1, col=1):
+    """Add RSI line with overbought/oversold levels"""
+    fig.add_trace(go.Scattergl(
+        x=x_positions, y=data['RSI'].to_numpy(),
+        customdata=hover_time, hovertemplate='%{customdata}<br>RSI: %{y:.1f}',
         name='RSI', line=dict(color=COLORS['primary'], width=2)
-    ))
-    fig.add_hline(y=70, line_dash="dash", line_color=COLORS['danger'])
-    fig.add_hline(y=30, line_dash="dash", line_color=COLORS['success'])
-    
-    # Configure x-axis
-    n_points = len(data_copy)
-    step = max(1, n_points // 10)
-    tick_indices = list(range(0, n_points, step))
-    
-    tick_values = [data_copy.iloc[i]['x_index'] for i in tick_indices]
-    tick_texts = [data_copy.iloc[i]['Datetime'].strftime('%m/%d') for i in tick_indices]
-    
-    fig.update_layout(
-        title="RSI (14)",
-        height=250,
-        yaxis=dict(range=[0, 100], showgrid=True, gridcolor=COLORS['border']),
-        xaxis=dict(
-            tickmode='array',
-            tickvals=tick_values,
-            ticktext=tick_texts,
-            showgrid=True,
-            gridcolor=COLORS['border']
-        ),
-        paper_bgcolor=COLORS['bg_primary'],
-        plot_bgcolor=COLORS['bg_secondary'],
-        font=dict(color=COLORS['text_primary'])
-    )
-    
-    return fig
+    ), row=row, col=col)
+    fig.add_hline(y=70, line_dash="dash", line_color=COLORS['danger'], row=row, col=col)
+    fig.add_hline(y=30, line_dash="dash", line_color=COLORS['success'], row=row, col=col)
+    fig.update_yaxes(range=[0, 100], row=row, col=col)
 
-def create_macd_chart(data):
-    """Create MACD chart"""
-    data_copy = data.copy()
-    data_copy['x_index'] = range(len(data_copy))
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=data_copy['x_index'], y=data_copy['MACD'],
+def add_macd_traces(fig, data, x_positions, hover_time, row=1, col=1):
+    """Add MACD, signal and histogram traces"""
+    fig.add_trace(go.Scattergl(
+        x=x_positions, y=data['MACD'].to_numpy(),
+        customdata=hover_time, hovertemplate='%{customdata}<br>MACD: %{y:.4f}',
         name='MACD', line=dict(color=COLORS['info'])
-    ))
-    fig.add_trace(go.Scatter(
-        x=data_copy['x_index'], y=data_copy['MACD_Signal'],
+    ), row=row, col=col)
+    fig.add_trace(go.Scattergl(
+        x=x_positions, y=data['MACD_Signal'].to_numpy(),
         name='Signal', line=dict(color=COLORS['danger'])
-    ))
+    ), row=row, col=col)
     
-    if 'MACD_Hist' in data_copy.columns:
-        colors_macd = [COLORS['success'] if x >= 0 else COLORS['danger'] for x in data_copy['MACD_Hist']]
+    if 'MACD_Hist' in data.columns:
+        colors_macd = np.where(data['MACD_Hist'].to_numpy() >= 0, COLORS['success'], COLORS['danger'])
         fig.add_trace(go.Bar(
-            x=data_copy['x_index'], y=data_copy['MACD_Hist'],
+            x=x_positions, y=data['MACD_Hist'].to_numpy(),
             name='Histogram', marker_color=colors_macd, opacity=0.6
-        ))
-    
-    # Configure x-axis
-    n_points = len(data_copy)
-    step = max(1, n_points // 10)
-    tick_indices = list(range(0, n_points, step))
-    
-    tick_values = [data_copy.iloc[i]['x_index'] for i in tick_indices]
-    tick_texts = [data_copy.iloc[i]['Datetime'].strftime('%m/%d') for i in tick_indices]
-    
-    fig.update_layout(
-        title="MACD",
-        height=250,
-        xaxis=dict(
-            tickmode='array',
-            tickvals=tick_values,
-            ticktext=tick_texts,
-            showgrid=True,
-            gridcolor=COLORS['border']
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor=COLORS['border']
-        ),
-        paper_bgcolor=COLORS['bg_primary'],
-        plot_bgcolor=COLORS['bg_secondary'],
-        font=dict(color=COLORS['text_primary'])
-    )
-    
-    return fig
+        ), row=row, col=col)
 
-def styled_metric(text, color_bg, color_text):
-    """Create styled metric display"""
-    st.markdown(
-        f"""
-        <div style="
-            background-color: {color_bg};
-            padding: 8px 12px;
-            border-radius: 4px;
-            color: {color_text};
-            font-weight: 500;
-            margin-bottom: 5px;
-        ">
-            {text}
-        </div>
-        """, unsafe_allow_html=True
-    )
\ No newline at end of file
+def styled_metric(text, color_bg=None, color_text=None):
+    """Create styled metric display (base and neutral style come from apply_minimal_style)"""
+    style = (f'background-color:{color_bg};' if color_bg else '') + (f'color:{color_text};' if color_text else '')
+    attr = f' style="{style}"' if style else ''
+    st.html(f'<div class="metric-box"{attr}>{text}</div>')
\ No newline at end of file
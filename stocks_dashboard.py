@@ -3,15 +3,14 @@ import plotly.graph_objects as go
 import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
-import ta
 from curl_cffi import requests
 
 # Import components and styles
 from components import (
-    get_session, get_currency, format_price, fetch_data, 
-    add_indicators, calculate_metrics, create_price_chart,
-    create_volume_chart, create_rsi_chart, create_macd_chart,
-    styled_metric
+    get_session, get_currency, format_price, fetch_many,
+    get_data_with_indicators, calculate_metrics, create_dashboard_figure,
+    create_technical_figure, make_time_ticks, styled_metric,
+    WATCHLIST, WATCHLIST_SYMBOLS, OPTIONAL_INDICATORS
 )
 from styles import apply_minimal_style, COLORS
 
@@ -62,12 +61,13 @@ intervals = {
 # Main dashboard
 if st.sidebar.button("Update Dashboard", type="primary", use_container_width=True) or auto_refresh:
     with st.spinner(f"Loading {ticker} data..."):
-        data = fetch_data(ticker, period, intervals[period])
+        # Only the optional indicators change the computation, so only they join the cache key
+        wanted = frozenset(OPTIONAL_INDICATORS.keys() & set(indicators))
+        data = get_data_with_indicators(ticker, period, intervals[period], wanted)
         
         if not data.empty:
-            data = add_indicators(data)
             currency = get_currency(ticker)
-            last_close, change, pct_change, high, low, volume = calculate_metrics(data)
+            last_close, change, pct_change, high, low, volume, has_volume = calculate_metrics(data)
             
             if last_close is not None:
                 # Display key metrics
@@ -88,33 +88,23 @@ if st.sidebar.button("Update Dashboard", type="primary", use_container_width=Tru
                 with col4:
                     st.metric("Volume", f"{volume:,}")
                 
+                # Shared x-axis ticks for the technical charts
+                tickvals, ticktext = make_time_ticks(data['Datetime'])
+                
                 # Tabs
                 tab1, tab2, tab3 = st.tabs(["Price Chart", "Technical Analysis", "Data Summary"])
                 
                 with tab1:
-                    # Main chart
-                    fig = create_price_chart(data, ticker, currency, chart_type, indicators)
+                    # Main chart with volume pane
+                    fig = create_dashboard_figure(data, ticker, currency, chart_type, indicators,
+                                                  show_volume and has_volume)
                     st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Volume chart
-                    if show_volume and not data['Volume'].isna().all():
-                        fig_vol = create_volume_chart(data)
-                        st.plotly_chart(fig_vol, use_container_width=True)
                 
                 with tab2:
-                    col1, col2 = st.columns(2)
-                    
-                    # RSI
-                    if 'RSI' in indicators and 'RSI' in data.columns:
-                        with col1:
-                            fig_rsi = create_rsi_chart(data)
-                            st.plotly_chart(fig_rsi, use_container_width=True)
-                    
-                    # MACD
-                    if 'MACD' in indicators and 'MACD' in data.columns:
-                        with col2:
-                            fig_macd = create_macd_chart(data)
-                            st.plotly_chart(fig_macd, use_container_width=True)
+                    # RSI and MACD
+                    fig_ta = create_technical_figure(data, indicators, tickvals, ticktext)
+                    if fig_ta is not None:
+                        st.plotly_chart(fig_ta, use_container_width=True)
                 
                 with tab3:
                     col1, col2 = st.columns(2)
@@ -141,7 +131,7 @@ if st.sidebar.button("Update Dashboard", type="primary", use_container_width=Tru
                             elif rsi_val < 30:
                                 styled_metric(f"RSI: {rsi_val:.1f} (Oversold)", COLORS['info'], COLORS['text_primary'])
                             else:
-                                styled_metric(f"RSI: {rsi_val:.1f} (Neutral)", COLORS['bg_tertiary'], COLORS['text_secondary'])
+                                styled_metric(f"RSI: {rsi_val:.1f} (Neutral)")
 
                         # MA signals
                         if 'SMA_20' in data.columns and 'SMA_50' in data.columns:
@@ -160,7 +150,7 @@ if st.sidebar.button("Update Dashboard", type="primary", use_container_width=Tru
                         elif curr_vol < avg_vol * 0.5:
                             styled_metric("Volume: Low", COLORS['warning'], COLORS['text_primary'])
                         else:
-                            styled_metric("Volume: Normal", COLORS['bg_tertiary'], COLORS['text_secondary'])
+                            styled_metric("Volume: Normal")
             
         else:
             st.error(f"Unable to fetch data for {ticker}")
@@ -169,18 +159,13 @@ if st.sidebar.button("Update Dashboard", type="primary", use_container_width=Tru
 with st.sidebar:
     st.header("Quick Watchlist")
     
-    watchlist = {
-        'US Tech': ['AAPL', 'GOOGL', 'MSFT'],
-        'European': ['SAP.DE', 'ASML.AS'],
-        'Asian': ['TSM', '7203.T'],
-        'Indonesian': ['GOTO.JK', 'BBCA.JK', 'TLKM.JK']
-    }
+    quick_data_by_symbol = fetch_many(WATCHLIST_SYMBOLS, '1d', '5m')
     
-    for category, symbols in watchlist.items():
+    for category, symbols in WATCHLIST.items():
         with st.expander(category):
             for symbol in symbols:
                 try:
-                    quick_data = fetch_data(symbol, '1d', '5m')
+                    quick_data = quick_data_by_symbol.get(symbol, pd.DataFrame())
                     if not quick_data.empty:
                         curr_price = quick_data['Close'].iloc[-1]
                         open_price = quick_data['Open'].iloc[0]
@@ -1,7 +1,7 @@
-import streamlit as st
+from types import MappingProxyType
 
-# Color constants for charts and components
-COLORS = {
+# Color constants for charts and components (read-only)
+COLORS = MappingProxyType({
     'primary': '#6366f1',
     'secondary': '#10b981',
     'success': '#10b981',
@@ -15,16 +15,37 @@ COLORS = {
     'bg_secondary': '#1e293b',
     'bg_tertiary': '#334155',
     'border': '#334155',
-}
+})
+
+# Shared Plotly styling, built once and reused by every figure
+CHART_LAYOUT = MappingProxyType({
+    'paper_bgcolor': COLORS['bg_primary'],
+    'plot_bgcolor': COLORS['bg_secondary'],
+    'font_color': COLORS['text_primary'],
+})
+CHART_AXIS = MappingProxyType({'showgrid': True, 'gridcolor': COLORS['border']})
+
+# Color cycle for overlay indicator lines
+INDICATOR_COLORS = (COLORS['secondary'], COLORS['warning'], COLORS['info'], COLORS['primary'], COLORS['danger'])
+
+# Palette as CSS custom properties (--bg-primary, --text-secondary, ...); the
+# only COLORS interpolation, the stylesheet rules reference the variables
+_ROOT_VARS = ":root{" + ";".join(f"--{name.replace('_', '-')}:{value}" for name, value in COLORS.items()) + "}"
+
+# Built once at import; the palette is inlined (it comes from COLORS), the rules
+# are served from static/ so the browser caches them instead of receiving them
+# over the websocket on every rerun
+_ROOT_STYLE = '<style>' + _ROOT_VARS + '</style>'
+_STYLESHEET_LINK = '<link rel="stylesheet" href="app/static/minimal.css">'
 
 def apply_minimal_style():
     """Apply minimal custom styling only for elements not handled by config.toml"""
+    # Imported here so COLORS and the chart styling load without Streamlit
+    import streamlit as st
     
-    st.markdown("""
-    <style>
-        /* Hide Streamlit branding elements */
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        header {visibility: hidden;}
-    </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    # Must run on every rerun: Streamlit drops elements a rerun doesn't re-emit,
+    # so injecting the styles once per session would unstyle the page afterwards.
+    # st.html skips the Markdown parser and ships style-only content without layout space
+    st.html(_ROOT_STYLE)
+    # st.html's sanitizer strips <link>, so the stylesheet goes through markdown
+    st.markdown(_STYLESHEET_LINK, unsafe_allow_html=True)